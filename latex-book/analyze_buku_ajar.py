@@ -1,106 +1,185 @@
 #!/usr/bin/env python3
 """
 Analyze extracted Buku-Ajar content and organize by chapters
+
+The extraction output is read page by page. Each page is matched against the
+chapter rules from buku_ajar_chapters.json, all compiled into one alternation
+regex. The resulting page ranges form a sorted interval index (bisect
+lookups) that assigns every page and image to a chapter. The mapping is
+saved as chapter_mapping.json, so later stages can load it instead of
+parsing the text again.
 """
 
+import argparse
+import json
 import re
-import os
+import sys
+from bisect import bisect_right
+from pathlib import Path
+
+PAGE_RE = re.compile(r'PAGE (\d+)')
+RULE_LINE = '=' * 80
+
+
+def load_rules(path):
+    """Chapter rules: list of {key, title, markers}, in priority order"""
+    return json.loads(Path(path).read_text(encoding='utf-8'))['chapters']
+
+
+def compile_rules(rules):
+    """One regex for all markers; group r<i> matches a marker of rule i"""
+    alternatives = [f"(?P<r{i}>{'|'.join(re.escape(m) for m in rule['markers'])})"
+                    for i, rule in enumerate(rules)]
+    return re.compile('|'.join(alternatives))
+
+
+def iter_pages(content_file):
+    """Stream (page number, page text) from an extract_pdf text file"""
+    page_num = None
+    lines = []
+    with open(content_file, encoding='utf-8') as f:
+        previous = None
+        for line in f:
+            stripped = line.rstrip('\n')
+            match = PAGE_RE.fullmatch(stripped)
+            if match and previous == RULE_LINE:
+                if page_num is not None:
+                    yield page_num, ''.join(lines[:-1])  # drop the opening rule
+                page_num = int(match.group(1))
+                lines = []
+                previous = None
+                next(f, None)  # closing rule
+                continue
+            lines.append(line)
+            previous = stripped
+    if page_num is not None:
+        yield page_num, ''.join(lines)
+
+
+def detect_chapter(pattern, text):
+    """Index of the highest-priority rule with a marker on the page, or None"""
+    found = {int(name[1:]) for match in pattern.finditer(text)
+             for name, value in match.groupdict().items() if value}
+    return min(found) if found else None
 
-def analyze_content():
+
+class ChapterIndex:
+    """Sorted, non-overlapping page intervals [start, end] -> chapter key"""
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals)
+        self.starts = [start for start, _, _ in self.intervals]
+
+    def add_page(self, page_num, key):
+        """Extend the last interval or open a new one (pages come in order)"""
+        if self.intervals and self.intervals[-1][2] == key:
+            start, _, _ = self.intervals[-1]
+            self.intervals[-1] = (start, page_num, key)
+        else:
+            self.intervals.append((page_num, page_num, key))
+            self.starts.append(page_num)
+
+    def chapter_of(self, page_num):
+        i = bisect_right(self.starts, page_num) - 1
+        if i >= 0 and page_num <= self.intervals[i][1]:
+            return self.intervals[i][2]
+        return None
+
+
+def read_image_pages(images_dir):
+    """(page, image) pairs from images/index.tsv, or from page_<n> file names"""
+    images_dir = Path(images_dir)
+    index_file = images_dir / "index.tsv"
+    if index_file.exists():
+        with open(index_file, encoding='utf-8') as f:
+            for line in f:
+                page, name = line.rstrip('\n').split('\t')
+                yield int(page), name
+    elif images_dir.exists():
+        for image in sorted(images_dir.iterdir()):
+            match = re.search(r'page_(\d+)', image.name)
+            if match:
+                yield int(match.group(1)), image.name
+
+
+def analyze_content(content_file="buku_ajar_extracted/buku_ajar_content.txt",
+                    images_dir="buku_ajar_extracted/images",
+                    rules_file="buku_ajar_chapters.json"):
     """Parse the extracted content and organize by chapters"""
-    
-    content_file = "buku_ajar_extracted/buku_ajar_content.txt"
-    
-    with open(content_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Split by page markers
-    pages = re.split(r'={80}\nPAGE (\d+)\n={80}', content)
-    
-    # Organize content by chapters
-    chapters = {
-        'ch01': {'title': 'Pengantar Algoritma Genetika', 'pages': [], 'images': []},
-        'ch02': {'title': 'Holland Schema', 'pages': [], 'images': []},
-        'ch03': {'title': 'Encoding', 'pages': [], 'images': []},
-        'ch04': {'title': 'Selection', 'pages': [], 'images': []},
-        'ch05': {'title': 'Crossover', 'pages': [], 'images': []},
-        'ch08': {'title': 'Mutation and Update', 'pages': [], 'images': []},
-    }
-    
+    rules = load_rules(rules_file)
+    pattern = compile_rules(rules)
+    chapters = {rule['key']: {'title': rule['title'], 'pages': [], 'images': []}
+                for rule in rules}
+
+    index = ChapterIndex()
     current_chapter = None
-    
-    # Process pages
-    i = 1
-    while i < len(pages):
-        page_num = int(pages[i])
-        page_content = pages[i+1] if i+1 < len(pages) else ""
-        
-        # Detect chapter transitions
-        if '1) Pengantar Algoritma Genetika' in page_content:
-            current_chapter = 'ch01'
-        elif '2) Holland Schema' in page_content:
-            current_chapter = 'ch02'
-        elif '3) Encoding' in page_content:
-            current_chapter = 'ch03'
-        elif '4) Selection' in page_content:
-            current_chapter = 'ch04'
-        elif '5) Crossover' in page_content or '6) Crossover' in page_content or '7) Crossover' in page_content or '8) Crossover' in page_content:
-            current_chapter = 'ch05'
-        elif '11) Operator Mutasi' in page_content or '12) Perbaikan Generasi' in page_content or '13) Parameter' in page_content:
-            current_chapter = 'ch08'
-        
+    for page_num, text in iter_pages(content_file):
+        rule = detect_chapter(pattern, text)
+        if rule is not None:
+            current_chapter = rules[rule]['key']
         if current_chapter:
-            chapters[current_chapter]['pages'].append({
-                'num': page_num,
-                'content': page_content
-            })
-        
-        i += 2
-    
-    # Print summary
+            index.add_page(page_num, current_chapter)
+            chapters[current_chapter]['pages'].append(page_num)
+
+    for page_num, image in read_image_pages(images_dir):
+        key = index.chapter_of(page_num)
+        if key:
+            chapters[key]['images'].append(image)
+
+    return {
+        'source': str(content_file),
+        'intervals': [{'start': start, 'end': end, 'chapter': key}
+                      for start, end, key in index.intervals],
+        'chapters': chapters,
+    }
+
+
+def load_mapping(path="buku_ajar_extracted/chapter_mapping.json"):
+    """Load a saved mapping; returns (mapping, ChapterIndex)"""
+    mapping = json.loads(Path(path).read_text(encoding='utf-8'))
+    index = ChapterIndex((i['start'], i['end'], i['chapter'])
+                         for i in mapping['intervals'])
+    return mapping, index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--content', default="buku_ajar_extracted/buku_ajar_content.txt")
+    parser.add_argument('--images', default="buku_ajar_extracted/images")
+    parser.add_argument('--rules', default="buku_ajar_chapters.json")
+    parser.add_argument('--output-dir', type=Path, default=Path("buku_ajar_extracted"))
+    args = parser.parse_args()
+
+    mapping = analyze_content(args.content, args.images, args.rules)
+    chapters = mapping['chapters']
+
     print("Chapter Analysis:")
     print("=" * 80)
     for ch_key, ch_data in chapters.items():
-        if ch_data['pages']:
-            page_nums = [p['num'] for p in ch_data['pages']]
+        page_nums = ch_data['pages']
+        if page_nums:
             print(f"\n{ch_key.upper()}: {ch_data['title']}")
-            print(f"  Pages: {min(page_nums)} - {max(page_nums)}")
+            print(f"  Pages: {page_nums[0]} - {page_nums[-1]}")
             print(f"  Total pages: {len(page_nums)}")
-            print(f"  Page numbers: {page_nums}")
-    
-    # List images
-    print("\n\nImages Extracted:")
-    print("=" * 80)
-    images_dir = "buku_ajar_extracted/images"
-    if os.path.exists(images_dir):
-        images = sorted(os.listdir(images_dir))
-        for img in images:
-            if img.endswith('.png'):
-                # Extract page number from filename
-                match = re.search(r'page_(\d+)', img)
-                if match:
-                    page_num = int(match.group(1))
-                    # Assign to chapter
-                    for ch_key, ch_data in chapters.items():
-                        page_nums = [p['num'] for p in ch_data['pages']]
-                        if page_nums and min(page_nums) <= page_num <= max(page_nums):
-                            chapters[ch_key]['images'].append(img)
-                            print(f"  {img} -> {ch_key} ({ch_data['title']})")
-                            break
-    
-    return chapters
+            print(f"  Images: {len(ch_data['images'])}")
 
-if __name__ == "__main__":
-    chapters = analyze_content()
-    
-    # Save chapter mapping
-    with open("buku_ajar_extracted/chapter_mapping.txt", 'w', encoding='utf-8') as f:
+    (args.output_dir / "chapter_mapping.json").write_text(
+        json.dumps(mapping, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    # Human-readable summary
+    with open(args.output_dir / "chapter_mapping.txt", 'w', encoding='utf-8') as f:
         f.write("Chapter Mapping Summary\n")
         f.write("=" * 80 + "\n\n")
-        
+
         for ch_key, ch_data in chapters.items():
             if ch_data['pages']:
                 f.write(f"{ch_key.upper()}: {ch_data['title']}\n")
-                f.write(f"  Pages: {[p['num'] for p in ch_data['pages']]}\n")
+                f.write(f"  Pages: {ch_data['pages']}\n")
                 f.write(f"  Images: {ch_data['images']}\n")
                 f.write("\n")
+
+    print(f"\nMapping saved to: {args.output_dir / 'chapter_mapping.json'}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Incremental build driver for the book (PDF and, optionally, DOCX)
+
+Steps:
+  1. Render stale figures (build_figures.py).
+  2. In parallel: the LaTeX chain and, with --docx, the pandoc DOCX export.
+
+The LaTeX chain is skipped when every input recorded in the previous run's
+.fls file (chapters, references.bib, included figures) hashes the same as
+before. Otherwise pdflatex runs once; bibtex runs only if the citations in
+main.aux or references.bib changed, and pdflatex is rerun only until the
+.aux/.toc/.lof/.lot/.out hashes stop changing. Run from latex-book/.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+MAIN = "main"
+OUTPUT_DIR = Path("output")
+STATE_NAME = ".build_state.json"
+AUX_EXTENSIONS = ['.aux', '.toc', '.lof', '.lot', '.out']
+CITATION_RE = re.compile(r'\\(?:citation|bibdata|bibstyle)\{[^}]*\}')
+
+
+def file_hash(path):
+    """SHA-256 of a file, or None if it does not exist"""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def aux_hashes(output_dir):
+    """Hashes of the files that feed back into the next pdflatex run"""
+    return {ext: file_hash(output_dir / f"{MAIN}{ext}") for ext in AUX_EXTENSIONS}
+
+
+def citation_key(output_dir):
+    """Hash of the citation lines in main.aux plus references.bib"""
+    digest = hashlib.sha256()
+    aux = output_dir / f"{MAIN}.aux"
+    if aux.exists():
+        for match in CITATION_RE.finditer(aux.read_text(encoding='utf-8', errors='replace')):
+            digest.update(match.group(0).encode('utf-8'))
+    digest.update((file_hash("references.bib") or '').encode('utf-8'))
+    return digest.hexdigest()
+
+
+def recorded_inputs(output_dir):
+    """Project files pdflatex read in its last run, from main.fls"""
+    fls = output_dir / f"{MAIN}.fls"
+    if not fls.exists():
+        return []
+    root = Path.cwd().resolve()
+    inputs = set()
+    for line in fls.read_text(encoding='utf-8', errors='replace').splitlines():
+        if not line.startswith('INPUT '):
+            continue
+        path = (root / line[len('INPUT '):]).resolve()
+        # TeX distribution files and our own outputs are not dependencies
+        if root in path.parents and output_dir.resolve() not in path.parents:
+            inputs.add(str(path.relative_to(root)))
+    return sorted(inputs)
+
+
+def input_hashes(paths):
+    return {path: file_hash(path) for path in paths}
+
+
+def load_state(path):
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def run(command, cwd=None, env=None):
+    """Run a build command; raises RuntimeError with its output tail on failure"""
+    print(f"  $ {' '.join(command)}")
+    result = subprocess.run(command, cwd=cwd, env=env, capture_output=True,
+                            text=True, errors='replace')
+    if result.returncode != 0:
+        tail = '\n'.join(result.stdout.splitlines()[-20:])
+        raise RuntimeError(f"{command[0]} failed ({result.returncode}):\n{tail}")
+    return result
+
+
+def pdflatex(output_dir):
+    run(['pdflatex', '-interaction=nonstopmode', '-halt-on-error', '-recorder',
+         f'-output-directory={output_dir}', f'{MAIN}.tex'])
+
+
+def build_pdf(output_dir, state, max_runs=5, force=False):
+    """Run the LaTeX chain only as far as needed; returns the number of passes"""
+    pdf = output_dir / f"{MAIN}.pdf"
+    inputs = state.get('inputs', {})
+    if (not force and pdf.exists() and inputs
+            and input_hashes(inputs) == inputs):
+        print("PDF up to date")
+        return 0
+
+    before = aux_hashes(output_dir)
+    pdflatex(output_dir)
+    passes = 1
+
+    citations = citation_key(output_dir)
+    bbl = output_dir / f"{MAIN}.bbl"
+    bbl_changed = False
+    # A missing .bbl (e.g. after make clean) needs bibtex even if citations match
+    if force or citations != state.get('citations') or not bbl.exists():
+        old_bbl = file_hash(bbl)
+        shutil.copy("references.bib", output_dir / "references.bib")
+        run(['bibtex', MAIN], cwd=output_dir)
+        bbl_changed = file_hash(bbl) != old_bbl
+    else:
+        print("Citations unchanged, skipping bibtex")
+
+    # Rerun until the auxiliary files reach a fixed point
+    after = aux_hashes(output_dir)
+    while (after != before or bbl_changed) and passes < max_runs:
+        before, bbl_changed = after, False
+        pdflatex(output_dir)
+        passes += 1
+        after = aux_hashes(output_dir)
+    if after != before:
+        print(f"Warning: auxiliary files still changing after {passes} passes")
+
+    state['citations'] = citations
+    state['inputs'] = input_hashes(recorded_inputs(output_dir))
+    return passes
+
+
+def docx_inputs():
+    """Files the pandoc export reads (it follows \\input and \\includegraphics)"""
+    return sorted([f"{MAIN}.tex", "references.bib"] +
+                  [str(p) for p in Path("chapters").glob("*.tex")] +
+                  [str(p) for p in Path("figures").iterdir()
+                   if p.suffix in ('.png', '.pdf', '.jpg')])
+
+
+def build_docx(output_dir, state, force=False):
+    """pandoc DOCX export, only when its inputs changed"""
+    docx = output_dir / f"{MAIN}.docx"
+    key = hashlib.sha256(json.dumps(input_hashes(docx_inputs()),
+                                    sort_keys=True).encode('utf-8')).hexdigest()
+    if not force and docx.exists() and state.get('docx') == key:
+        print("DOCX up to date")
+        return False
+    if shutil.which('pandoc') is None:
+        print("pandoc not found, skipping DOCX export")
+        return False
+    run(['pandoc', f'{MAIN}.tex', '-o', str(docx), '--bibliography=references.bib',
+         '--citeproc', '--toc', '--number-sections', '--standalone'])
+    state['docx'] = key
+    return True
+
+
+def build(output_dir=OUTPUT_DIR, figures=True, docx=False, force=False,
+          max_runs=5, workers=None):
+    """Bring the PDF (and DOCX) up to date; returns the number of pdflatex passes"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state_path = output_dir / STATE_NAME
+    state = load_state(state_path)
+
+    if figures:
+        import build_figures
+        print("Figures:")
+        build_figures.build(workers=workers, force=force)
+
+    # pdflatex and pandoc read the same sources but write different files
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pdf_job = executor.submit(build_pdf, output_dir, state, max_runs, force)
+        docx_job = executor.submit(build_docx, output_dir, state, force) if docx else None
+        passes = pdf_job.result()
+        if docx_job:
+            docx_job.result()
+
+    tmp = state_path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding='utf-8')
+    os.replace(tmp, state_path)
+    return passes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR)
+    parser.add_argument('--docx', action='store_true', help="also export DOCX")
+    parser.add_argument('--no-figures', action='store_true')
+    parser.add_argument('--force', action='store_true',
+                        help="rebuild everything regardless of the recorded state")
+    parser.add_argument('--max-runs', type=int, default=5,
+                        help="upper bound on pdflatex passes")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        passes = build(args.output_dir, figures=not args.no_figures, docx=args.docx,
+                       force=args.force, max_runs=args.max_runs, workers=args.workers)
+    except RuntimeError as e:
+        print(e)
+        return 1
+    print(f"Done: {passes} pdflatex passes in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Figure build pipeline for the crossover illustrations in figures/
+
+Discovers every figures/create_*_graphics.py generator, renders them headless
+(Agg backend) in a process pool and skips any figure whose inputs are
+unchanged: the hash covers the generator source, the shared helper modules in
+figures/, its PARAMS, the dpi and the matplotlib version. Run from latex-book/.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+
+FIGURES_DIR = Path("figures")
+CACHE_NAME = ".figure_cache.json"
+
+
+def discover(figures_dir=FIGURES_DIR):
+    """All generator scripts, in a stable order"""
+    return sorted(Path(figures_dir).glob("create_*_graphics.py"))
+
+
+def load_generator(script):
+    """Import a generator and return (module, entry point)
+
+    create_pmx_graphics.py provides create_pmx_visualization(), and so on.
+    """
+    script = Path(script).resolve()
+    # Generators may import shared helpers that live next to them
+    if str(script.parent) not in sys.path:
+        sys.path.insert(0, str(script.parent))
+    spec = importlib.util.spec_from_file_location(script.stem, script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    name = script.stem[len("create_"):-len("_graphics")]
+    return module, getattr(module, f"create_{name}_visualization")
+
+
+def input_hash(script, params, dpi):
+    """Hash of everything that determines the rendered files"""
+    script = Path(script)
+    digest = hashlib.sha256()
+    helpers = [p for p in sorted(script.parent.glob("*.py"))
+               if not p.name.startswith("create_")]
+    for path in [script] + helpers:
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+    digest.update(f"dpi={dpi};matplotlib={matplotlib.__version__}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render(script, output_dir, dpi):
+    """Render one generator in a worker process"""
+    _, create = load_generator(script)
+    outputs = create(output_dir=output_dir, dpi=dpi)
+    return [str(path) for path in outputs]
+
+
+def build(figures_dir=FIGURES_DIR, output_dir=None, dpi=300, workers=None,
+          force=False):
+    """Render every stale figure and return the names that were rebuilt"""
+    output_dir = Path(output_dir or figures_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = output_dir / CACHE_NAME
+    cache = {}
+    if cache_path.exists():
+        cache = json.loads(cache_path.read_text(encoding='utf-8'))
+
+    stale = {}
+    for script in discover(figures_dir):
+        module, _ = load_generator(script)
+        key = input_hash(script, getattr(module, 'PARAMS', {}), dpi)
+        entry = cache.get(script.name)
+        up_to_date = (entry is not None and entry['hash'] == key and
+                      all(Path(p).exists() for p in entry['outputs']))
+        if force or not up_to_date:
+            stale[script] = key
+        else:
+            print(f"  up to date: {script.name}")
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(render, script, output_dir, dpi): script
+                       for script in stale}
+            for future in as_completed(futures):
+                script = futures[future]
+                outputs = future.result()
+                cache[script.name] = {'hash': stale[script], 'outputs': outputs}
+                print(f"  rendered:   {script.name} -> "
+                      f"{', '.join(Path(p).name for p in outputs)}")
+
+        # Write atomically so an interrupted build never leaves a broken cache
+        tmp = cache_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp, cache_path)
+
+    return [script.name for script in stale]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--figures-dir', default=str(FIGURES_DIR))
+    parser.add_argument('--output-dir', default=None,
+                        help="defaults to the figures directory")
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true',
+                        help="render every figure even if its inputs are unchanged")
+    args = parser.parse_args()
+
+    rebuilt = build(figures_dir=args.figures_dir, output_dir=args.output_dir,
+                    dpi=args.dpi, workers=args.workers, force=args.force)
+    print(f"Figures rebuilt: {len(rebuilt)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Parallel per-page PDF extraction (text and images) with PyMuPDF
+
+Extraction is incremental: a manifest in .extract_cache/ records the hash of
+the source PDF and of every page (content streams, geometry and everything
+reachable from its resources: fonts, Form XObjects and images), and the
+text of each page is kept in its own file. An unchanged PDF is skipped
+after hashing it; otherwise only new or changed pages are extracted, in
+page ranges split across a process pool. The text file is written strictly
+in page order as results arrive: unchanged pages come from the per-page
+cache, and only a bounded number of finished ranges is held in memory.
+
+Images are named by a hash of their raw stream, so repeated images (logos,
+headers) are stored once; images/index.tsv lists the images of every page.
+JPEG and JPEG 2000 streams are written through byte for byte; other images
+(and images with a soft mask) are decoded and saved as PNG.
+
+Used by extract_buku_ajar.py, extract_week9.py and extract_pdf_content.py.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz  # PyMuPDF < 1.24.3
+
+RULE = '=' * 80
+PAGE_HEADER = "\n{rule}\nPAGE {page}\n{rule}\n\n"
+
+CACHE_DIR = ".extract_cache"
+MANIFEST_VERSION = 2
+
+REF_RE = re.compile(r'(\d+) 0 R')
+# Back references to the page tree would make every page depend on all others
+BACK_REF_RE = re.compile(r'/(?:Parent|P)\s+\d+\s+0\s+R')
+
+
+def page_chunks(pages, chunk_pages):
+    """Split a list of page indices into chunks of chunk_pages pages"""
+    return [pages[start:start + chunk_pages]
+            for start in range(0, len(pages), chunk_pages)]
+
+
+def file_hash(path):
+    """SHA-256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def object_digest(doc, xref, images, memo, active=None):
+    """Digest of a PDF object and every object it references, recursively
+
+    Image streams are only hashed when images are extracted; their
+    dictionaries (size, filters) always are. Shared objects such as fonts
+    are hashed once per document through memo.
+    """
+    if xref in memo:
+        return memo[xref]
+    active = set() if active is None else active
+    if xref in active:
+        return b'cycle'
+    active.add(xref)
+    source = doc.xref_object(xref, compressed=True)
+    digest = hashlib.sha256(source.encode('utf-8'))
+    if doc.xref_is_stream(xref):
+        kind, subtype = doc.xref_get_key(xref, "Subtype")
+        if images or subtype != '/Image':
+            digest.update(doc.xref_stream_raw(xref))
+    digest.update(references_digest(doc, source, images, memo, active))
+    active.discard(xref)
+    memo[xref] = digest.digest()
+    return memo[xref]
+
+
+def references_digest(doc, source, images, memo, active=None):
+    """Combined digest of the objects referenced by an object's source"""
+    digest = hashlib.sha256()
+    for ref in REF_RE.findall(BACK_REF_RE.sub('', source)):
+        digest.update(object_digest(doc, int(ref), images, memo, active))
+    return digest.digest()
+
+
+def page_resources(doc, page):
+    """(kind, value) of the page's /Resources, following inheritance"""
+    xref = page.xref
+    while True:
+        kind, value = doc.xref_get_key(xref, "Resources")
+        if kind != 'null':
+            return kind, value
+        kind, parent = doc.xref_get_key(xref, "Parent")
+        if kind != 'xref':
+            return kind, value
+        xref = int(parent.split()[0])
+
+
+def page_hashes(doc, images):
+    """Hash of every page: content streams, geometry and resolved resources"""
+    memo = {}
+    hashes = []
+    for page in doc:
+        digest = hashlib.sha256(page.read_contents())
+        digest.update(f"{tuple(page.mediabox)}{tuple(page.cropbox)}{page.rotation}"
+                      .encode('utf-8'))
+        kind, value = page_resources(doc, page)
+        if kind == 'xref':
+            digest.update(object_digest(doc, int(value.split()[0]), images, memo))
+        elif kind == 'dict':
+            digest.update(value.encode('utf-8'))
+            digest.update(references_digest(doc, value, images, memo))
+        hashes.append(digest.hexdigest())
+    return hashes
+
+
+def load_manifest(path):
+    """Previous manifest, or an empty one if missing, unreadable or outdated"""
+    try:
+        manifest = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def write_atomic(path, text):
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+# Filters whose stream already is a standalone image file
+PASSTHROUGH = {'/DCTDecode': 'jpg', '/JPXDecode': 'jp2'}
+
+
+def save_image(doc, xref, smask, image_dir):
+    """Write one image XObject, named by content hash; returns the file name"""
+    raw = doc.xref_stream_raw(xref)
+    digest = hashlib.sha256(raw)
+    if smask:
+        digest.update(doc.xref_stream_raw(smask))
+    kind, value = doc.xref_get_key(xref, "Filter")
+    ext = PASSTHROUGH.get(value) if kind == 'name' and not smask else None
+    name = f"{digest.hexdigest()[:20]}.{ext or 'png'}"
+    path = Path(image_dir) / name
+    if path.exists():
+        return name  # already written (by this run, another worker or a previous run)
+
+    data = None
+    if ext:
+        data = raw
+    elif not smask:
+        # MuPDF's own PNG keeps palettes and bit depth, so it is the smallest
+        extracted = doc.extract_image(xref)
+        if extracted['ext'] == 'png':
+            data = extracted['image']
+    if data is None:
+        pix = fitz.Pixmap(doc, xref)
+        if pix.n - pix.alpha >= 4:  # CMYK and similar: PNG needs RGB
+            pix = fitz.Pixmap(fitz.csRGB, pix)
+        if smask:
+            pix = fitz.Pixmap(pix, fitz.Pixmap(doc, smask))
+        data = pix.tobytes('png')
+
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return name
+
+
+def extract_pages(pdf_path, indices, page_dir, image_dir=None):
+    """Worker: text of the given pages, also cached in page_dir; saves their images"""
+    pages = []
+    saved = {}  # xref -> file name, for images shared between pages
+    with fitz.open(pdf_path) as doc:
+        for index in indices:
+            page = doc[index]
+            images = []
+            if image_dir is not None:
+                for info in page.get_images(full=True):
+                    xref, smask = info[0], info[1]
+                    if xref not in saved:
+                        try:
+                            saved[xref] = save_image(doc, xref, smask, image_dir)
+                        except Exception as e:
+                            print(f"  Error saving image {xref} on page {index + 1}: {e}")
+                            saved[xref] = None
+                    if saved[xref]:
+                        images.append(saved[xref])
+            text = page.get_text()
+            write_atomic(Path(page_dir) / f"{index + 1:05d}.txt", text)
+            pages.append((index, text, images))
+    return pages
+
+
+def extract(pdf_path, output_dir, text_name=None, images=True, workers=None,
+            chunk_pages=8, header=PAGE_HEADER, footer="\n", skip_empty=False,
+            preamble='', force=False):
+    """Extract a PDF into output_dir; returns (text file, image count)"""
+    pdf_path = Path(pdf_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    image_dir = None
+    if images:
+        image_dir = output_dir / "images"
+        image_dir.mkdir(exist_ok=True)
+    text_file = output_dir / (text_name or f"{pdf_path.stem}.txt")
+
+    # One cache per text file, since several PDFs may share output_dir
+    cache_dir = output_dir / CACHE_DIR / text_file.stem
+    page_dir = cache_dir / "pages"
+    page_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = cache_dir / "manifest.json"
+    manifest = {} if force else load_manifest(manifest_file)
+
+    pdf_hash = file_hash(pdf_path)
+    layout = [header, footer, skip_empty, preamble]
+    if (manifest.get('pdf') == pdf_hash and manifest.get('images') == images
+            and manifest.get('layout') == layout and text_file.exists()):
+        print(f"{pdf_path.name}: unchanged, skipping extraction")
+        return text_file, manifest['image_count']
+
+    with fitz.open(pdf_path) as doc:
+        hashes = page_hashes(doc, images)
+    old_pages = manifest.get('pages', []) if manifest.get('images') == images else []
+    pages = [{'hash': h, 'images': []} for h in hashes]
+    changed = []
+    for index, page in enumerate(pages):
+        old = old_pages[index] if index < len(old_pages) else None
+        if (old and old['hash'] == page['hash']
+                and (page_dir / f"{index + 1:05d}.txt").exists()):
+            page['images'] = old['images']
+        else:
+            changed.append(index)
+
+    chunks = page_chunks(changed, chunk_pages)
+    workers = min(workers or os.cpu_count() or 1, max(len(chunks), 1))
+    print(f"Extracting {pdf_path.name}: {len(changed)} of {len(pages)} pages "
+          f"changed, {workers} workers")
+
+    texts = {}  # extracted pages waiting for their turn in the text file
+    pending = set(changed)
+    next_page = 0
+    tmp = text_file.with_suffix('.tmp')
+    with ProcessPoolExecutor(max_workers=workers) as executor, \
+            open(tmp, 'w', encoding='utf-8') as out:
+        out.write(preamble)
+        submitted = 0
+        written = 0  # chunks whose pages are all in the text file
+        running = set()
+        while next_page < len(pages):
+            # Keep at most 2 chunks per worker in flight or waiting to be written
+            while submitted < len(chunks) and submitted - written < 2 * workers:
+                future = executor.submit(extract_pages, str(pdf_path), chunks[submitted],
+                                         str(page_dir), image_dir and str(image_dir))
+                running.add(future)
+                submitted += 1
+
+            # Stream every page that is next in page order
+            while next_page < len(pages):
+                if next_page in pending:
+                    if next_page not in texts:
+                        break
+                    text = texts.pop(next_page)
+                    pending.discard(next_page)
+                else:
+                    text = (page_dir / f"{next_page + 1:05d}.txt").read_text(encoding='utf-8')
+                next_page += 1
+                if not (skip_empty and not text.strip()):
+                    out.write(header.format(rule=RULE, page=next_page))
+                    out.write(text)
+                    out.write(footer)
+            while written < submitted and chunks[written][-1] < next_page:
+                written += 1
+
+            if running and next_page < len(pages):
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for index, text, page_images in future.result():
+                        texts[index] = text
+                        pages[index]['images'] = page_images
+    os.replace(tmp, text_file)
+    for stale in page_dir.glob("*.txt"):
+        if int(stale.stem) > len(pages):
+            stale.unlink()
+
+    image_count = sum(len(page['images']) for page in pages)
+    if images:
+        write_atomic(image_dir / "index.tsv", ''.join(
+            f"{page_num}\t{name}\n"
+            for page_num, page in enumerate(pages, 1) for name in page['images']))
+    unique_images = {name for page in pages for name in page['images']}
+
+    # Written last, so an interrupted run is simply redone
+    write_atomic(manifest_file, json.dumps({
+        'version': MANIFEST_VERSION, 'pdf': pdf_hash, 'images': images,
+        'layout': layout, 'image_count': image_count, 'pages': pages}))
+
+    print(f"Text saved to: {text_file}")
+    print(f"Images extracted: {image_count} ({len(unique_images)} unique)")
+    return text_file, image_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pdf', nargs='+', type=Path)
+    parser.add_argument('--output-dir', type=Path, default=Path("extracted_pdf"))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-pages', type=int, default=8)
+    parser.add_argument('--no-images', action='store_true')
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the extraction cache")
+    args = parser.parse_args()
+
+    for pdf_path in args.pdf:
+        if not pdf_path.exists():
+            print(f"Error: PDF file not found at {pdf_path}")
+            return 1
+        extract(pdf_path, args.output_dir / pdf_path.stem, images=not args.no_images,
+                workers=args.workers, chunk_pages=args.chunk_pages, force=args.force)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
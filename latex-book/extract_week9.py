@@ -3,9 +3,12 @@
 Extract content from Week 9 PDF about Mutation and Update Generation
 """
 
-import fitz  # PyMuPDF
 from pathlib import Path
 
+from extract_pdf import extract
+
+PAGE_HEADER = "\n" + "=" * 60 + "\nPage {page}\n" + "=" * 60 + "\n"
+
 def extract_week9_content():
     pdf_path = Path(__file__).parent.parent / "Course Material Week 9 - GA - Mutation and Update Generation.pdf"
     
@@ -15,32 +18,13 @@ def extract_week9_content():
     
     print(f"Processing: {pdf_path.name}")
     
-    # Open PDF
-    doc = fitz.open(pdf_path)
-    
-    full_text = []
-    
-    # Extract text from each page
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text = page.get_text()
-        
-        full_text.append(f"\n{'='*60}\n")
-        full_text.append(f"Page {page_num + 1}\n")
-        full_text.append(f"{'='*60}\n")
-        full_text.append(text)
-    
-    doc.close()
-    
-    # Save to file
-    output_file = Path(__file__).parent / "week9_extracted.txt"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(''.join(full_text))
+    output_file, _ = extract(pdf_path, Path(__file__).parent,
+                             text_name="week9_extracted.txt", images=False,
+                             header=PAGE_HEADER, footer='')
     
     print(f"✓ Extracted to: {output_file}")
-    print(f"Total pages: {len(doc)}")
     
-    return ''.join(full_text)
+    return output_file.read_text(encoding='utf-8')
 
 if __name__ == "__main__":
     content = extract_week9_content()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Shared chromosome-strip renderer for the crossover and mutation figures
+
+A chromosome row is drawn as one PatchCollection with a per-gene color array
+instead of one Rectangle artist per gene, so figures with 100+ genes stay fast
+and small. The per-gene lookups (segment, cycle, changed position) are built
+once as arrays by the operator helpers (PMX, CX, OX and mutation) below.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import PatchCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.patches import Rectangle
+
+CELL_HEIGHT = 0.8
+MAX_LABELS = 60  # longer chromosomes are drawn without gene values
+CYCLE_COLORS = ['lightcoral', 'lightyellow', 'lightpink', 'lightcyan']
+
+
+# ---------------------------------------------------------------------------
+# Drawing primitives
+# ---------------------------------------------------------------------------
+
+def _gene_colors(colors, n):
+    """Broadcast a single color or a per-gene list to an (n, 4) RGBA array"""
+    rgba = to_rgba_array(colors)
+    return np.broadcast_to(rgba, (n, 4)) if len(rgba) == 1 else rgba
+
+
+def group_colors(groups, palette, default='lightgray'):
+    """Per-gene colors from group ids (-1 = no group)"""
+    groups = np.asarray(groups)
+    table = to_rgba_array(list(palette) + [default])
+    return table[np.where(groups >= 0, groups % len(palette), len(palette))]
+
+
+def draw_strip(ax, genes, y=0, colors='lightblue', label=None,
+               edgecolor='black', linewidth=2, fontsize=12, show_positions=False):
+    """Draw one chromosome row as a single collection"""
+    genes = list(genes)
+    n = len(genes)
+    cells = PatchCollection([Rectangle((i, y), 1, CELL_HEIGHT) for i in range(n)],
+                            facecolors=_gene_colors(colors, n),
+                            edgecolors=edgecolor, linewidths=linewidth)
+    ax.add_collection(cells)
+
+    if n <= MAX_LABELS:
+        for i, value in enumerate(genes):
+            ax.text(i + 0.5, y + CELL_HEIGHT / 2, str(value), ha='center',
+                    va='center', fontsize=fontsize, fontweight='bold')
+            if show_positions:
+                ax.text(i + 0.5, y - 0.3, str(i), ha='center', va='center',
+                        fontsize=fontsize - 2, style='italic')
+    if label:
+        ax.text(-1, y + CELL_HEIGHT / 2, label, ha='right', va='center',
+                fontweight='bold')
+        if show_positions:
+            ax.text(-1, y - 0.3, 'Positions:', ha='right', va='center',
+                    fontsize=fontsize - 2, style='italic')
+    return cells
+
+
+def highlight_cells(ax, positions, y=0, facecolor='yellow', edgecolor='red',
+                    linewidth=3, alpha=0.7):
+    """Overlay a set of cells (e.g. conflicts) with one collection"""
+    overlay = PatchCollection([Rectangle((i, y), 1, CELL_HEIGHT) for i in positions],
+                              facecolors=facecolor, edgecolors=edgecolor,
+                              linewidths=linewidth, alpha=alpha)
+    ax.add_collection(overlay)
+    return overlay
+
+
+def draw_cuts(ax, cut1, cut2, top):
+    """Dashed cut-point markers"""
+    for x, name in ((cut1, 'Cut 1'), (cut2, 'Cut 2')):
+        ax.axvline(x=x, color='red', linestyle='--', linewidth=2)
+        ax.text(x, top, name, ha='center', color='red', fontweight='bold')
+
+
+def draw_notes(ax, x, y, title, lines, spacing=0.2, fontsize=10, color='black'):
+    """A bold heading followed by a column of note lines"""
+    if title:
+        ax.text(x, y, title, ha='left', va='center', fontweight='bold', color=color)
+    for i, line in enumerate(lines):
+        ax.text(x, y - (i + 1) * spacing, line, ha='left', va='center',
+                fontsize=fontsize, color=color)
+
+
+def step_axes(fig, rows, index, title, n, ylim, notes_width=7):
+    """One step panel; the x-range grows with the chromosome length"""
+    ax = fig.add_subplot(rows, 1, index)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlim(-2, n + 1 + notes_width)
+    ax.set_ylim(*ylim)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    return ax
+
+
+def new_figure(n, height):
+    """Figure wide enough for n genes plus the note column"""
+    return plt.figure(figsize=(max(16, 0.15 * n + 10), height))
+
+
+def draw_comparison(ax, chromosomes, valid_children):
+    """Final panel: parents and children stacked, plus a validity note"""
+    for row, (label, chromosome, color) in enumerate(chromosomes):
+        draw_strip(ax, chromosome, row, color, label)
+    n = len(chromosomes[0][1])
+    for i, (name, valid) in enumerate(valid_children):
+        ax.text(n + 1, len(chromosomes) - 0.5 - 0.35 * i,
+                f'{name}: {"✓ Valid" if valid else "✗ Invalid"} permutation',
+                ha='left', va='center', fontweight='bold',
+                color='green' if valid else 'red')
+
+
+def is_permutation(child, parent):
+    """True if child holds exactly the genes of parent"""
+    return sorted(child) == sorted(parent)
+
+
+# ---------------------------------------------------------------------------
+# Operators with precomputed per-gene lookups
+# ---------------------------------------------------------------------------
+
+def segment_groups(n, cut1, cut2):
+    """Group id per position: 0 inside [cut1, cut2), -1 outside"""
+    groups = np.full(n, -1)
+    groups[cut1:cut2] = 0
+    return groups
+
+
+def pmx(parent1, parent2, cut1, cut2):
+    """PMX child 1 with the intermediate state used by the figure"""
+    p1_segment = parent1[cut1:cut2]
+    p2_segment = parent2[cut1:cut2]
+    temp = list(parent1)
+    temp[cut1:cut2] = p2_segment
+
+    # Value -> replacement lookup built once (P2 segment value -> P1 value)
+    replacement = dict(zip(p2_segment, p1_segment))
+    outside = [i for i in range(len(temp)) if i < cut1 or i >= cut2]
+    conflicts = [i for i in outside if temp[i] in replacement]
+
+    child = list(temp)
+    steps = []
+    for i in conflicts:
+        value = temp[i]
+        while value in replacement:
+            value = replacement[value]
+        child[i] = value
+        steps.append(f"Pos {i}: {temp[i]} → {value}")
+    return {'p1_segment': p1_segment, 'p2_segment': p2_segment, 'temp': temp,
+            'conflicts': conflicts, 'child': child, 'steps': steps}
+
+
+def find_cycles(parent1, parent2):
+    """Cycles of CX and the cycle id of every position"""
+    position_in_p1 = {value: i for i, value in enumerate(parent1)}
+    cycle_of = np.full(len(parent1), -1)
+    cycles = []
+    for start in range(len(parent1)):
+        if cycle_of[start] >= 0:
+            continue
+        cycle = []
+        current = start
+        while cycle_of[current] < 0:
+            cycle_of[current] = len(cycles)
+            cycle.append(current)
+            current = position_in_p1[parent2[current]]
+        cycles.append(cycle)
+    return cycles, cycle_of
+
+
+def cycle_crossover(parent1, parent2, cycle_of):
+    """Both CX children: even cycles from one parent, odd from the other"""
+    from_first = cycle_of % 2 == 0
+    child1 = np.where(from_first, parent1, parent2).tolist()
+    child2 = np.where(from_first, parent2, parent1).tolist()
+    return child1, child2
+
+
+def cycle_trace(parent1, parent2, cycle):
+    """Textual trace of one cycle for the explanation column"""
+    lines = [f"Start at pos {cycle[0]}: P1[{cycle[0]}]={parent1[cycle[0]]}, "
+             f"P2[{cycle[0]}]={parent2[cycle[0]]}"]
+    for pos, next_pos in zip(cycle, cycle[1:] + cycle[:1]):
+        if pos != cycle[0]:
+            lines.append(f"At pos {pos}: P1[{pos}]={parent1[pos]}, P2[{pos}]={parent2[pos]}")
+        done = " (cycle complete)" if next_pos == cycle[0] else ""
+        lines.append(f"Find {parent2[pos]} in P1: position {next_pos}{done}")
+    return lines
+
+
+def order_crossover(parent1, parent2, cut1, cut2):
+    """OX child: P1 segment kept, remaining genes in P2 order after cut 2"""
+    n = len(parent1)
+    kept = set(parent1[cut1:cut2])
+    order = [parent2[(cut2 + k) % n] for k in range(n)]
+    fill = iter(value for value in order if value not in kept)
+    child = list(parent1)
+    for k in range(n - (cut2 - cut1)):
+        child[(cut2 + k) % n] = next(fill)
+    return child
+
+
+MUTATIONS = ('swap', 'insert', 'inversion', 'scramble')
+
+
+def mutate(chromosome, operator, i, j, seed=0):
+    """Mutated copy and the mask of positions whose gene changed"""
+    child = list(chromosome)
+    a, b = min(i, j), max(i, j)
+    if operator == 'swap':
+        child[i], child[j] = child[j], child[i]
+    elif operator == 'insert':
+        child.insert(j, child.pop(i))
+    elif operator == 'inversion':
+        child[a:b + 1] = child[a:b + 1][::-1]
+    elif operator == 'scramble':
+        segment = child[a:b + 1]
+        child[a:b + 1] = list(np.random.default_rng(seed).permutation(segment))
+    else:
+        raise ValueError(f"Unknown mutation operator: {operator}")
+    changed = np.asarray(child) != np.asarray(chromosome)
+    return child, changed
+
+
+# ---------------------------------------------------------------------------
+# Complete step-by-step figures
+# ---------------------------------------------------------------------------
+
+def pmx_figure(parent1, parent2, cut1, cut2):
+    """Five-step PMX illustration"""
+    n = len(parent1)
+    result = pmx(parent1, parent2, cut1, cut2)
+    segment = segment_groups(n, cut1, cut2)
+    fig = new_figure(n, 12)
+
+    ax = step_axes(fig, 5, 1, 'Step 1: Original Parents', n, (-0.5, 2.5), 0)
+    draw_strip(ax, parent1, 1, group_colors(segment, ['lightcoral'], 'lightblue'), 'Parent 1:')
+    draw_strip(ax, parent2, 0, group_colors(segment, ['lightcoral'], 'lightgreen'), 'Parent 2:')
+    draw_cuts(ax, cut1, cut2, 2.2)
+
+    ax = step_axes(fig, 5, 2, 'Step 2: Create Mapping from Selected Segments',
+                   2 * len(result['p1_segment']), (-0.5, 2), 4)
+    # Segment genes are spaced two cells apart to leave room for the arrows
+    x = 2 * np.arange(len(result['p1_segment']))
+    for y, values in ((1, result['p1_segment']), (0, result['p2_segment'])):
+        ax.add_collection(PatchCollection(
+            [Rectangle((xi, y), 1, CELL_HEIGHT) for xi in x],
+            facecolors='lightcoral', edgecolors='black', linewidths=2))
+        for xi, value in zip(x, values):
+            ax.text(xi + 0.5, y + CELL_HEIGHT / 2, str(value), ha='center',
+                    va='center', fontsize=12, fontweight='bold')
+    for xi in x:
+        ax.annotate('', xy=(xi + 0.5, 0.8), xytext=(xi + 0.5, 1),
+                    arrowprops=dict(arrowstyle='<->', color='red', lw=2))
+    ax.text(-1, 1.4, 'P1 segment:', ha='right', va='center', fontweight='bold')
+    ax.text(-1, 0.4, 'P2 segment:', ha='right', va='center', fontweight='bold')
+    draw_notes(ax, x[-1] + 2, 1, 'Mapping:',
+               [f"{a} ↔ {b}" for a, b in zip(result['p1_segment'], result['p2_segment'])],
+               spacing=0.3, fontsize=11)
+
+    ax = step_axes(fig, 5, 3, 'Step 3: Exchange Segments Between Parents', n, (-0.5, 1.5))
+    draw_strip(ax, result['temp'], 0,
+               group_colors(segment, ['lightcoral'], 'lightblue'), 'Child 1 (temp):')
+    highlight_cells(ax, result['conflicts'])
+    draw_notes(ax, n + 1, 0.8, 'Conflicts (duplicates):',
+               [f"Positions: {result['conflicts']}"], spacing=0.4, color='red')
+
+    ax = step_axes(fig, 5, 4, 'Step 4: Resolve Conflicts Using Mapping', n, (-0.5, 1.2))
+    draw_strip(ax, result['child'], 0,
+               group_colors(segment, ['lightcoral'], 'lightgreen'), 'Child 1 (final):')
+    draw_notes(ax, n + 1, 0.8, 'Resolution steps:', result['steps'][:6], spacing=0.2)
+
+    ax = step_axes(fig, 5, 5, 'Step 5: Final Result Comparison', n, (-0.5, 3.5))
+    draw_comparison(ax, [('Parent 1:', parent1, 'lightblue'),
+                         ('Parent 2:', parent2, 'lightgreen'),
+                         ('Child 1:', result['child'], 'lightyellow')],
+                    [('Child 1', is_permutation(result['child'], parent1))])
+    return fig
+
+
+def cycle_crossover_figure(parent1, parent2):
+    """Six-step CX illustration"""
+    n = len(parent1)
+    cycles, cycle_of = find_cycles(parent1, parent2)
+    child1, child2 = cycle_crossover(parent1, parent2, cycle_of)
+    cycle_colors = group_colors(cycle_of, CYCLE_COLORS)
+    first_cycle = np.where(cycle_of == 0, 0, -1)
+    fig = new_figure(n, 14)
+
+    ax = step_axes(fig, 6, 1, 'Step 1: Original Parents with Position Indices',
+                   n, (-0.8, 2.2), 0)
+    draw_strip(ax, parent1, 1, 'lightblue', 'Parent 1:', show_positions=True)
+    draw_strip(ax, parent2, 0, 'lightgreen', 'Parent 2:', show_positions=True)
+
+    ax = step_axes(fig, 6, 2, 'Step 2: Find Cycle 1 (Starting from Position 0)',
+                   n, (-0.5, 2.3), 10)
+    draw_strip(ax, parent1, 1, group_colors(first_cycle, CYCLE_COLORS), 'Parent 1:')
+    draw_strip(ax, parent2, 0, group_colors(first_cycle, CYCLE_COLORS), 'Parent 2:')
+    for pos, next_pos in zip(cycles[0], cycles[0][1:]):
+        ax.annotate('', xy=(next_pos + 0.5, 1.8), xytext=(pos + 0.5, 1.8),
+                    arrowprops=dict(arrowstyle='->', color='red', lw=2))
+    draw_notes(ax, n + 1, 1.5, 'Cycle 1 positions:', [str(cycles[0])], spacing=0.3)
+    draw_notes(ax, n + 1, 1.05, None,
+               cycle_trace(parent1, parent2, cycles[0])[:6], spacing=0.15, fontsize=9)
+
+    ax = step_axes(fig, 6, 3, 'Step 3: Identify All Cycles', n, (-0.5, 2), 8)
+    draw_strip(ax, parent1, 1, cycle_colors, 'Parent 1:')
+    draw_strip(ax, parent2, 0, cycle_colors, 'Parent 2:')
+    ax.text(n + 1, 1.4, 'All Cycles:', ha='left', va='center', fontweight='bold')
+    shown = cycles[:6]
+    ax.add_collection(PatchCollection(
+        [Rectangle((n + 1, 1.1 - i * 0.3), 0.3, 0.2) for i in range(len(shown))],
+        facecolors=group_colors(np.arange(len(shown)), CYCLE_COLORS),
+        edgecolors='black'))
+    for i, cycle in enumerate(shown):
+        ax.text(n + 1.4, 1.2 - i * 0.3, f'Cycle {i+1}: {cycle}', ha='left', va='center')
+
+    for index, (name, child, first, second) in enumerate(
+            [('Child 1', child1, 'Parent 1', 'Parent 2'),
+             ('Child 2', child2, 'Parent 2', 'Parent 1')]):
+        short = {'Parent 1': 'P1', 'Parent 2': 'P2'}
+        ax = step_axes(fig, 6, 4 + index,
+                       f'Step {4 + index}: Create {name} (Alternate cycles: '
+                       f'C1 from {short[first]}, C2 from {short[second]}, etc.)',
+                       n, (-0.5, 1.2))
+        draw_strip(ax, child, 0, cycle_colors, f'{name}:')
+        draw_notes(ax, n + 1, 0.8, 'Source for each cycle:',
+                   [f'Cycle {i+1}: from {first if i % 2 == 0 else second}'
+                    for i in range(min(len(cycles), 5))])
+
+    ax = step_axes(fig, 6, 6, 'Step 6: Final Result Comparison', n, (-0.5, 4.5))
+    draw_comparison(ax, [('Parent 1:', parent1, 'lightblue'),
+                         ('Parent 2:', parent2, 'lightgreen'),
+                         ('Child 1:', child1, 'lightyellow'),
+                         ('Child 2:', child2, 'lightpink')],
+                    [('Child 1', is_permutation(child1, parent1)),
+                     ('Child 2', is_permutation(child2, parent1))])
+    draw_notes(ax, n + 1, 2, 'Key Property:',
+               ['Each element maintains its', 'position from one parent'], spacing=0.3)
+    return fig
+
+
+def order_crossover_figure(parent1, parent2, cut1, cut2):
+    """Three-step OX illustration"""
+    n = len(parent1)
+    child = order_crossover(parent1, parent2, cut1, cut2)
+    segment = segment_groups(n, cut1, cut2)
+    fig = new_figure(n, 8)
+
+    ax = step_axes(fig, 3, 1, 'Step 1: Original Parents', n, (-0.5, 2.5), 0)
+    draw_strip(ax, parent1, 1, group_colors(segment, ['lightcoral'], 'lightblue'), 'Parent 1:')
+    draw_strip(ax, parent2, 0, 'lightgreen', 'Parent 2:')
+    draw_cuts(ax, cut1, cut2, 2.2)
+
+    ax = step_axes(fig, 3, 2, 'Step 2: Fill Remaining Genes in Parent 2 Order', n, (-0.5, 1.2))
+    filled = np.where(segment == 0, 0, 1)
+    draw_strip(ax, child, 0, group_colors(filled, ['lightcoral', 'lightgreen']), 'Child 1:')
+    draw_notes(ax, n + 1, 0.8, 'Filling starts after Cut 2:',
+               ['P1 segment kept in place', 'other genes taken from P2'])
+
+    ax = step_axes(fig, 3, 3, 'Step 3: Final Result Comparison', n, (-0.5, 3.5))
+    draw_comparison(ax, [('Parent 1:', parent1, 'lightblue'),
+                         ('Parent 2:', parent2, 'lightgreen'),
+                         ('Child 1:', child, 'lightyellow')],
+                    [('Child 1', is_permutation(child, parent1))])
+    return fig
+
+
+def mutation_figure(chromosome, operators, positions, seed=0):
+    """One panel per mutation operator, changed genes highlighted"""
+    n = len(chromosome)
+    fig = new_figure(n, 2.5 * len(operators))
+    i, j = positions
+    for index, operator in enumerate(operators, 1):
+        child, changed = mutate(chromosome, operator, i, j, seed)
+        ax = step_axes(fig, len(operators), index,
+                       f'{operator.capitalize()} Mutation (positions {i} and {j})',
+                       n, (-0.5, 2.5), 0)
+        draw_strip(ax, chromosome, 1, 'lightblue', 'Before:')
+        draw_strip(ax, child, 0, group_colors(np.where(changed, 0, -1),
+                                              ['lightcoral'], 'lightyellow'), 'After:')
+    return fig
+
+
+def save_figure(fig, output_dir, name, dpi=300):
+    """Write PNG and PDF versions and close the figure"""
+    outputs = [output_dir / f'{name}.png', output_dir / f'{name}.pdf']
+    fig.tight_layout()
+    fig.savefig(outputs[0], dpi=dpi, bbox_inches='tight')
+    fig.savefig(outputs[1], bbox_inches='tight')
+    plt.close(fig)
+    return outputs
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Permutation Mutation Visualization
+Creates before/after graphics for swap, insert, inversion and scramble mutation
+"""
+
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')  # headless: figures are only written to files
+
+from chromosome_strips import MUTATIONS, mutation_figure, save_figure
+
+FIGURES_DIR = Path(__file__).resolve().parent
+
+# Default example; build_figures.py hashes these together with this source
+PARAMS = {
+    'chromosome': [1, 2, 3, 4, 5, 6, 7, 8, 9],
+    'operators': list(MUTATIONS),
+    'positions': [2, 6],
+    'seed': 0,
+}
+
+def create_mutation_visualization(output_dir=FIGURES_DIR, dpi=300, params=None):
+    """Create a permutation mutation visualization, one panel per operator"""
+    params = {**PARAMS, **(params or {})}
+    fig = mutation_figure(list(params['chromosome']), list(params['operators']),
+                          tuple(params['positions']), params['seed'])
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return save_figure(fig, output_dir, 'mutation_detailed', dpi)
+
+if __name__ == "__main__":
+    create_mutation_visualization()
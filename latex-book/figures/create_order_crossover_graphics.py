@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Order Crossover (OX) Visualization
+Creates detailed step-by-step graphics for Order crossover example
+"""
+
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')  # headless: figures are only written to files
+
+from chromosome_strips import order_crossover_figure, save_figure
+
+FIGURES_DIR = Path(__file__).resolve().parent
+
+# Default example; build_figures.py hashes these together with this source
+PARAMS = {
+    'parent1': [1, 2, 3, 4, 5, 6, 7, 8, 9],
+    'parent2': [5, 4, 6, 9, 2, 3, 7, 1, 8],
+    'cut1': 3,
+    'cut2': 7,
+}
+
+def create_order_crossover_visualization(output_dir=FIGURES_DIR, dpi=300, params=None):
+    """Create a comprehensive Order Crossover visualization"""
+    params = {**PARAMS, **(params or {})}
+    fig = order_crossover_figure(list(params['parent1']), list(params['parent2']),
+                                 params['cut1'], params['cut2'])
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return save_figure(fig, output_dir, 'order_crossover_detailed', dpi)
+
+if __name__ == "__main__":
+    create_order_crossover_visualization()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Parameter observation study runner (Studi Observasi Parameter, chapter 7)
+
+Expands the parameter grid (N, bits per variable, Pc, Pm) x repeated seeds,
+runs every cell in a process pool and caches each finished cell on disk,
+keyed by a hash of its configuration, the study constants and the GA code,
+so an interrupted sweep resumes where it stopped and a changed budget or
+GA never reuses stale cells. Results are aggregated (mean/std/best) into the
+table printed in chapter07-mutation-update.tex.
+"""
+
+import argparse
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+# Grid used in the chapter (mutation is given relative to 1/L). The number of
+# generations G is deliberately not an axis: every run stops after
+# MAX_EVALUATIONS evaluated individuals (or at TARGET_FITNESS), so
+# G = MAX_EVALUATIONS / N follows from the population size and configurations
+# with different N are compared at equal cost.
+DEFAULT_GRID = {
+    'population_size': [50, 100, 200],
+    'bits': [10, 50, 90],
+    'crossover_rate': [0.5, 0.7, 0.9],
+    'mutation_factor': [0.5, 1.0, 2.0],
+}
+
+BOUNDS = (-10.0, 10.0)
+NUM_VARS = 2
+MAX_EVALUATIONS = 20000
+TARGET_FITNESS = 999.995  # 1000.00 after rounding to two decimals
+
+
+def fitness(x):
+    """Kebugaran = 1 / (x1^2 + x2^2 + 0.001), evaluated for a batch"""
+    return 1.0 / (np.sum(x**2, axis=1) + 0.001)
+
+
+def run_ga(population_size, bits, crossover_rate, mutation_factor, seed,
+           max_evaluations=MAX_EVALUATIONS, target_fitness=TARGET_FITNESS):
+    """Run one binary GA on h(x1, x2) and return best fitness and evaluations"""
+    rng = np.random.default_rng(seed)
+    length = NUM_VARS * bits
+    mutation_rate = mutation_factor / length
+
+    low, high = BOUNDS
+    weights = 2.0 ** np.arange(bits)[::-1]
+    scale = (high - low) / (2.0**bits - 1)
+
+    def evaluate(population):
+        genes = population.reshape(len(population), NUM_VARS, bits)
+        return fitness(low + scale * (genes @ weights))
+
+    population = rng.integers(0, 2, (population_size, length), dtype=np.uint8)
+    fitness_values = evaluate(population)
+    evaluations = population_size
+    best = fitness_values.max()
+
+    while best < target_fitness and evaluations < max_evaluations:
+        # Binary tournament selection
+        contenders = rng.integers(0, population_size, (population_size, 2))
+        winners = np.where(fitness_values[contenders[:, 0]] >=
+                           fitness_values[contenders[:, 1]],
+                           contenders[:, 0], contenders[:, 1])
+        parents = population[winners]
+
+        # One-point crossover on consecutive pairs
+        half = population_size // 2
+        mothers, fathers = parents[:half], parents[half:2 * half]
+        points = rng.integers(1, length, half)
+        do_cross = rng.random(half) < crossover_rate
+        mask = (np.arange(length) >= points[:, None]) & do_cross[:, None]
+        children = np.concatenate([np.where(mask, fathers, mothers),
+                                   np.where(mask, mothers, fathers),
+                                   parents[2 * half:]])
+
+        # Bit-flip mutation
+        children ^= (rng.random(children.shape) < mutation_rate).astype(np.uint8)
+
+        # Elitism: best of the old population replaces the worst child
+        child_fitness = evaluate(children)
+        evaluations += population_size
+        worst = np.argmin(child_fitness)
+        elite = np.argmax(fitness_values)
+        children[worst] = population[elite]
+        child_fitness[worst] = fitness_values[elite]
+
+        population, fitness_values = children, child_fitness
+        best = max(best, fitness_values.max())
+
+    return {'best_fitness': float(best), 'evaluations': int(evaluations)}
+
+
+def expand_grid(grid, repeats):
+    """Cartesian product of the grid with seeds 0..repeats-1"""
+    keys = sorted(grid)
+    for values in itertools.product(*(grid[k] for k in keys)):
+        config = dict(zip(keys, values))
+        for seed in range(repeats):
+            yield {**config, 'seed': seed}
+
+
+def study_settings():
+    """Everything besides the cell that determines a result"""
+    code = inspect.getsource(fitness) + inspect.getsource(run_ga)
+    return {
+        'bounds': BOUNDS,
+        'num_vars': NUM_VARS,
+        'max_evaluations': MAX_EVALUATIONS,
+        'target_fitness': TARGET_FITNESS,
+        'code': hashlib.sha256(code.encode('utf-8')).hexdigest()[:16],
+    }
+
+
+def cell_key(cell, settings):
+    """Stable hash of a cell configuration and the study settings"""
+    payload = json.dumps({'cell': cell, 'settings': settings},
+                         sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def run_cell(cell, settings):
+    result = run_ga(**cell, max_evaluations=settings['max_evaluations'],
+                    target_fitness=settings['target_fitness'])
+    return cell, result
+
+
+def run_sweep(grid=None, repeats=30, cache_dir="parameter_study_cache",
+              workers=None):
+    """Run all missing cells in parallel and return every cell result"""
+    grid = grid or DEFAULT_GRID
+    cache = Path(cache_dir)
+    cache.mkdir(parents=True, exist_ok=True)
+    settings = study_settings()
+
+    results = []
+    pending = []
+    for cell in expand_grid(grid, repeats):
+        cached = cache / f"{cell_key(cell, settings)}.json"
+        if cached.exists():
+            results.append(json.loads(cached.read_text(encoding='utf-8')))
+        else:
+            pending.append(cell)
+
+    print(f"Cells: {len(results) + len(pending)} "
+          f"(cached: {len(results)}, to run: {len(pending)})")
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_cell, cell, settings)
+                       for cell in pending]
+            for done, future in enumerate(as_completed(futures), 1):
+                cell, result = future.result()
+                record = {'cell': cell, 'settings': settings, 'result': result}
+
+                # Write atomically so an interrupted run never leaves a partial cell
+                target = cache / f"{cell_key(cell, settings)}.json"
+                tmp = target.with_suffix('.tmp')
+                tmp.write_text(json.dumps(record), encoding='utf-8')
+                os.replace(tmp, target)
+
+                results.append(record)
+                if done % 50 == 0 or done == len(pending):
+                    print(f"  finished {done}/{len(pending)}")
+
+    return results
+
+
+def aggregate(results):
+    """Group cell results per configuration and compute mean/std/best"""
+    groups = {}
+    for record in results:
+        cell = dict(record['cell'])
+        cell.pop('seed')
+        key = tuple(sorted(cell.items()))
+        groups.setdefault(key, []).append(record['result'])
+
+    rows = []
+    for key, runs in groups.items():
+        config = dict(key)
+        best = np.array([r['best_fitness'] for r in runs])
+        evaluations = np.array([r['evaluations'] for r in runs])
+        rows.append({
+            **config,
+            'mutation_rate': config['mutation_factor'] / (NUM_VARS * config['bits']),
+            'runs': len(runs),
+            'mean_best_fitness': float(best.mean()),
+            'std_best_fitness': float(best.std()),
+            'best_fitness': float(best.max()),
+            'mean_evaluations': float(evaluations.mean()),
+        })
+    # Same ordering as the chapter table: N, bits, Pc, Pm
+    rows.sort(key=lambda r: (r['population_size'], r['bits'],
+                             r['crossover_rate'], r['mutation_factor']))
+    return rows
+
+
+def latex_table(rows):
+    """Render the rows in the format of tab:ga-parameters, plus std and best"""
+    lines = [
+        r"\begin{tabular}{cccccccc}",
+        r"\toprule",
+        r"\textbf{Ukuran Pop} & \textbf{Bit} & \textbf{$P_c$} & \textbf{$P_m$} & "
+        r"\textbf{Rata-rata Kebugaran Terbaik} & \textbf{Simpangan Baku} & "
+        r"\textbf{Kebugaran Terbaik} & \textbf{Rata-rata Evaluasi} \\",
+        r"\midrule",
+    ]
+    for row in rows:
+        evaluations = f"{row['mean_evaluations']:.2f}".rstrip('0').rstrip('.')
+        lines.append(
+            f"{row['population_size']:<3} & {row['bits']} & {row['crossover_rate']} & "
+            f"{row['mutation_rate']:.4f} & {row['mean_best_fitness']:.2f} & "
+            f"{row['std_best_fitness']:.2f} & {row['best_fitness']:.2f} & "
+            f"{evaluations} \\\\")
+    lines += [r"\bottomrule", r"\end{tabular}"]
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-dir', default="parameter_study_cache")
+    parser.add_argument('--output-dir', default="parameter_study_output")
+    args = parser.parse_args()
+
+    results = run_sweep(repeats=args.repeats, cache_dir=args.cache_dir,
+                        workers=args.workers)
+    rows = aggregate(results)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "summary.json").write_text(json.dumps(rows, indent=2),
+                                             encoding='utf-8')
+    (output_dir / "ga_parameters_table.tex").write_text(latex_table(rows),
+                                                        encoding='utf-8')
+
+    print(f"\n{'N':>4} {'Bit':>4} {'Pc':>4} {'Pm':>7} {'Mean':>9} {'Std':>8} "
+          f"{'Best':>9} {'Evals':>9}")
+    for row in rows:
+        print(f"{row['population_size']:>4} {row['bits']:>4} {row['crossover_rate']:>4} "
+              f"{row['mutation_rate']:>7.4f} {row['mean_best_fitness']:>9.2f} "
+              f"{row['std_best_fitness']:>8.2f} {row['best_fitness']:>9.2f} "
+              f"{row['mean_evaluations']:>9.1f}")
+    print(f"\nTable written to: {output_dir / 'ga_parameters_table.tex'}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
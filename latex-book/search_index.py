@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Full-text index over the extracted course material and the book chapters
+
+Every page of the extracted text files (buku_ajar_content.txt,
+week9_extracted.txt, extracted_content/*.txt) and every section of
+chapters/*.tex becomes one document. Postings (term, document, frequency)
+are kept in SQLite; on update only files whose content hash changed are
+re-tokenized. Queries are ranked with BM25, and `suggest` lists the source
+pages that best match each section of a chapter.
+
+Usage (from latex-book/):
+    python search_index.py update
+    python search_index.py query "partially mapped crossover"
+    python search_index.py suggest chapters/chapter06-crossover.tex
+"""
+
+import argparse
+import hashlib
+import math
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+INDEX_PATH = Path(".search_index.sqlite")
+SOURCES = [
+    "buku_ajar_extracted/buku_ajar_content.txt",
+    "week9_extracted.txt",
+    "extracted_content/*.txt",
+    "chapters/*.tex",
+]
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+WORD_RE = re.compile(r"[^\W\d_]{2,}")
+LATEX_CMD_RE = re.compile(r"\\[A-Za-z]+\*?")
+PAGE_RE = re.compile(r"(?:PAGE|Page) (\d+)")
+SECTION_RE = re.compile(r"\\(chapter|section|subsection)\*?\{(.*)\}")
+
+STOPWORDS = frozenset("""
+    yang dan di ke dari untuk dengan ini itu pada adalah dalam atau akan tidak
+    juga dapat oleh sebagai setiap jika maka karena lebih antara bahwa telah
+    suatu secara tersebut hal ada the of and to in is a an for on by as be are
+    with this that from at or it its we can which using used
+""".split())
+
+
+def tokenize(text):
+    """Lowercase words of two or more letters, without LaTeX commands"""
+    text = LATEX_CMD_RE.sub(' ', text).lower()
+    return [w for w in WORD_RE.findall(text) if w not in STOPWORDS]
+
+
+def iter_pages(path):
+    """(label, line, text) per page of an extract_pdf text file"""
+    page_num, start, lines = None, 1, []
+    previous = None
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            stripped = line.strip()
+            match = PAGE_RE.fullmatch(stripped)
+            if match and previous and set(previous) == {'='}:
+                if page_num is not None:
+                    yield f"page {page_num}", start, ''.join(lines[:-1])
+                page_num, start, lines = int(match.group(1)), line_no, []
+                previous = None
+                continue
+            lines.append(line)
+            previous = stripped
+    if page_num is not None:
+        yield f"page {page_num}", start, ''.join(lines)
+
+
+def iter_sections(path):
+    """(label, line, text) per \\chapter/\\section/\\subsection of a .tex file"""
+    title, start, lines = "(preamble)", 1, []
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            match = SECTION_RE.search(line)
+            if match:
+                if ''.join(lines).strip():
+                    yield title, start, ''.join(lines)
+                title, start, lines = match.group(2), line_no, []
+            lines.append(line)
+    if ''.join(lines).strip():
+        yield title, start, ''.join(lines)
+
+
+def file_hash(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class SearchIndex:
+    """Inverted index of pages and sections in SQLite."""
+
+    def __init__(self, path=INDEX_PATH):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.executescript(
+            'CREATE TABLE IF NOT EXISTS files ('
+            ' path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, hash TEXT);'
+            'CREATE TABLE IF NOT EXISTS docs ('
+            ' id INTEGER PRIMARY KEY, path TEXT, kind TEXT, label TEXT,'
+            ' line INTEGER, length INTEGER);'
+            'CREATE INDEX IF NOT EXISTS docs_path ON docs (path);'
+            'CREATE TABLE IF NOT EXISTS postings ('
+            ' term TEXT, doc INTEGER, tf INTEGER, PRIMARY KEY (term, doc))'
+            ' WITHOUT ROWID;'
+            'CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);')
+
+    def remove_file(self, path):
+        docs = [row[0] for row in self.conn.execute(
+            'SELECT id FROM docs WHERE path = ?', (path,))]
+        self.conn.executemany('DELETE FROM postings WHERE doc = ?',
+                              [(doc,) for doc in docs])
+        self.conn.execute('DELETE FROM docs WHERE path = ?', (path,))
+        self.conn.execute('DELETE FROM files WHERE path = ?', (path,))
+
+    def add_file(self, path):
+        kind = 'section' if path.endswith('.tex') else 'page'
+        parts = iter_sections(path) if kind == 'section' else iter_pages(path)
+        for label, line, text in parts:
+            terms = Counter(tokenize(text))
+            cursor = self.conn.execute(
+                'INSERT INTO docs (path, kind, label, line, length) VALUES (?, ?, ?, ?, ?)',
+                (path, kind, label, line, sum(terms.values())))
+            self.conn.executemany('INSERT INTO postings VALUES (?, ?, ?)',
+                                  [(term, cursor.lastrowid, tf)
+                                   for term, tf in terms.items()])
+
+    def update(self, patterns=SOURCES):
+        """Re-index new or changed files, drop deleted ones; returns counts"""
+        paths = sorted({str(p) for pattern in patterns for p in Path().glob(pattern)})
+        known = {row[0]: row[1:] for row in self.conn.execute(
+            'SELECT path, size, mtime, hash FROM files')}
+        changed = 0
+        for path in paths:
+            stat = Path(path).stat()
+            old = known.get(path)
+            if old and old[:2] == (stat.st_size, stat.st_mtime_ns):
+                continue
+            digest = file_hash(path)
+            if old and old[2] == digest:
+                self.conn.execute('UPDATE files SET size = ?, mtime = ? WHERE path = ?',
+                                  (stat.st_size, stat.st_mtime_ns, path))
+                continue
+            self.remove_file(path)
+            self.add_file(path)
+            self.conn.execute('INSERT INTO files VALUES (?, ?, ?, ?)',
+                              (path, stat.st_size, stat.st_mtime_ns, digest))
+            changed += 1
+        removed = set(known) - set(paths)
+        for path in removed:
+            self.remove_file(path)
+        self.conn.commit()
+        return changed, len(removed), len(paths)
+
+    def search(self, terms, kind=None, limit=10):
+        """BM25-ranked [(score, path, label, line)] for a list of terms"""
+        where = ' WHERE kind = ?' if kind else ''
+        count, total = self.conn.execute(
+            f'SELECT COUNT(*), SUM(length) FROM docs{where}',
+            (kind,) if kind else ()).fetchone()
+        if not count:
+            return []
+        avg_length = total / count
+
+        scores = Counter()
+        for term in set(terms):
+            rows = self.conn.execute(
+                'SELECT p.doc, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc'
+                f' WHERE p.term = ?{" AND d.kind = ?" if kind else ""}',
+                (term, kind) if kind else (term,)).fetchall()
+            if not rows:
+                continue
+            idf = math.log(1 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+            for doc, tf, length in rows:
+                norm = tf + K1 * (1 - B + B * length / avg_length)
+                scores[doc] += idf * tf * (K1 + 1) / norm
+
+        results = []
+        for doc, score in scores.most_common():
+            path, label, line = self.conn.execute(
+                'SELECT path, label, line FROM docs WHERE id = ?', (doc,)).fetchone()
+            results.append((score, path, label, line))
+            if len(results) == limit:
+                break
+        return results
+
+    def query(self, text, kind=None, limit=10):
+        return self.search(tokenize(text), kind, limit)
+
+    def suggest(self, tex_path, limit=3, terms_per_section=20):
+        """For each section of a .tex file, the source pages that match it best"""
+        count = self.conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+        suggestions = []
+        for doc, label, line in self.conn.execute(
+                'SELECT id, label, line FROM docs WHERE path = ? ORDER BY line',
+                (tex_path,)).fetchall():
+            # The section's most distinctive terms (tf-idf) form the query
+            weighted = self.conn.execute(
+                'SELECT p.term, p.tf * (1.0 + ? / (SELECT COUNT(*) FROM postings q'
+                ' WHERE q.term = p.term)) AS w FROM postings p WHERE p.doc = ?'
+                ' ORDER BY w DESC LIMIT ?', (count, doc, terms_per_section)).fetchall()
+            pages = self.search([term for term, _ in weighted], kind='page', limit=limit)
+            suggestions.append((label, line, pages))
+        return suggestions
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--index', type=Path, default=INDEX_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('update', help="index new or changed files")
+    query = commands.add_parser('query', help="ranked pages/sections for a query")
+    query.add_argument('text')
+    query.add_argument('--kind', choices=['page', 'section'])
+    query.add_argument('-n', '--limit', type=int, default=10)
+    suggest = commands.add_parser('suggest', help="source pages for each section")
+    suggest.add_argument('tex')
+    suggest.add_argument('-n', '--limit', type=int, default=3)
+    args = parser.parse_args()
+
+    index = SearchIndex(args.index)
+    start = time.perf_counter()
+    if args.command != 'update':
+        index.update()  # cheap when nothing changed
+    if args.command == 'update':
+        changed, removed, total = index.update()
+        print(f"Indexed {changed} changed files, removed {removed} "
+              f"({total} files in index)")
+    elif args.command == 'query':
+        for score, path, label, line in index.query(args.text, args.kind, args.limit):
+            print(f"{score:7.2f}  {path}:{line}  {label}")
+    else:
+        tex = str(Path(args.tex))
+        for label, line, pages in index.suggest(tex, args.limit):
+            print(f"{tex}:{line}  {label}")
+            for score, path, page, _ in pages:
+                print(f"    {score:7.2f}  {path}  {page}")
+    index.close()
+    print(f"({(time.perf_counter() - start) * 1000:.1f} ms)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
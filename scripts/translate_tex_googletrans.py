@@ -1,30 +1,53 @@
 #!/usr/bin/env python3
 """Translate LaTeX chapter files to Indonesian using googletrans.
 
-This script is conservative: it preserves LaTeX commands, math ($...$, $$...$$),
-citations (\cite{...}), labels, and environments such as tikzpicture, align,
-equation, lstlisting, and verbatim. It translates:
+This script is conservative: it preserves LaTeX commands, math ($...$, $$...$$,
+\(...\), \[...\]), citations (\cite{...}), labels, and environments such as
+tikzpicture, align, equation, lstlisting, and verbatim (starred variants too).
+It translates:
 - chapter/section/subsection titles (the text inside braces)
-- captions (the text inside \caption{...})
+- captions (the text inside \caption{...}, also across lines)
 - paragraph text (lines not starting with '\\' and outside skipped envs)
 - \item text following a \item
 
-It writes translated files back into the same directory, making a .bak backup
-for each file before overwriting.
+Files are classified in a single pass by tokenize(); braces are matched with
+nesting, and placeholder protection/restoration each use one combined regex.
+A heading or caption whose brace is never closed is copied verbatim with a
+warning instead of aborting the run.
 
-Usage: python3 scripts/translate_tex_googletrans.py
+It writes translated files back into the same directory, making a .bak backup
+for each file before overwriting. With --output-dir the files are written
+there instead and the sources are left alone; --backend offline is always such
+a dry run (into a fresh temporary directory unless --output-dir is given).
+
+Every translated segment is stored in a local SQLite translation memory keyed
+by a hash of the placeholderized segment, the target language and the
+backend name, so a re-run
+after small edits only sends the changed segments to the backend, and output
+of one backend is never served to another. The backend is pluggable;
+--backend offline uses a stand-in that needs no network.
+
+The run has three phases: segments are collected from every .tex file first,
+the ones missing from the memory are sent in size-bounded batches through a
+rate-limited worker pool (with exponential-backoff retries and per-segment
+fallback to the source text), and finally each file is reassembled in order.
+
+Usage: python3 scripts/translate_tex_googletrans.py [--backend google|offline]
+                                                    [--output-dir DIR]
 """
 
+import argparse
+import hashlib
+import random
 import re
+import sqlite3
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-try:
-    from googletrans import Translator
-except Exception as e:
-    print("googletrans not available. Install with: pip install googletrans==4.0.0-rc1")
-    raise
-
 
 SKIP_ENVS = {
     'tikzpicture', 'axis', 'lstlisting', 'verbatim', 'algorithmic', 'algorithm',
@@ -32,184 +55,529 @@ SKIP_ENVS = {
 }
 
 TEX_DIR = Path('latex-book/chapters_id')
+MEMORY_PATH = Path('latex-book/.translation_memory.sqlite')
+
+
+class GoogleTransBackend:
+    """Backend using googletrans (network)."""
+
+    name = 'google'
+
+    def __init__(self):
+        try:
+            from googletrans import Translator
+        except Exception:
+            print("googletrans not available. Install with: pip install googletrans==4.0.0-rc1")
+            raise
+        self.translator = Translator()
+        self.calls = 0
+
+    def translate_batch(self, texts, dest):
+        self.calls += 1
+        return [res.text for res in self.translator.translate(list(texts), dest=dest)]
+
+
+class OfflineBackend:
+    """Stand-in backend for tests: tags the text instead of translating it.
+
+    latency and failure_rate simulate network round-trips and transient errors.
+    """
+
+    name = 'offline'
+
+    def __init__(self, tag='[{dest}] ', latency=0.0, failure_rate=0.0):
+        self.tag = tag
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+
+    def translate_batch(self, texts, dest):
+        self.calls += 1
+        time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            raise ConnectionError('simulated backend failure')
+        return [self.tag.format(dest=dest) + text for text in texts]
+
+
+BACKENDS = {
+    'google': GoogleTransBackend,
+    'offline': OfflineBackend,
+}
+
+
+class TranslationMemory:
+    """Persistent segment cache in SQLite, one entry per (segment, dest, backend)."""
+
+    def __init__(self, path=MEMORY_PATH):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS segments ('
+            ' key TEXT PRIMARY KEY, dest TEXT, source TEXT, target TEXT, backend TEXT)')
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text, dest, backend):
+        return hashlib.sha256(f'{backend}\0{dest}\0{text}'.encode('utf-8')).hexdigest()
+
+    def get(self, text, dest, backend):
+        row = self.conn.execute('SELECT target FROM segments WHERE key = ? AND backend = ?',
+                                (self.key(text, dest, backend), backend)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, text, dest, translation, backend):
+        self.conn.execute('INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?)',
+                          (self.key(text, dest, backend), dest, text, translation, backend))
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+# One combined pattern: each protected construct becomes a __KIND_n__ token
+PLACEHOLDER_RE = re.compile(
+    r"(?P<MATHD>\$\$.*?\$\$)"
+    r"|(?P<MATHB>\\\[.*?\\\])"
+    r"|(?P<MATHI>\\\(.*?\\\))"
+    r"|(?P<MATH>\$(?:[^$\\]|\\.)*\$)"
+    r"|(?P<CITE>\\cite[tp]?\*?(?:\[[^\]]*\])?\{[^}]*\})"
+    r"|(?P<REF>\\(?:ref|eqref|label|url|texttt)\{[^}]*\})"
+    r"|(?P<CMD>\\(?:[A-Za-z]+\*?|[^A-Za-z\s]))",
+    re.S)
+RESTORE_RE = re.compile(r"__(?:MATHD|MATHB|MATHI|MATH|CITE|REF|CMD)_\d+__")
 
 
 def placeholderize(text):
-    """Replace math and citations with placeholders and return mapping."""
+    """Replace math, citations, references and commands with placeholders."""
     placeholders = {}
-    i = 0
 
-    # replace display math $$...$$
-    def repl_display(m):
-        nonlocal i
-        key = f"__MATHD_{i}__"
+    def repl(m):
+        key = f"__{m.lastgroup}_{len(placeholders)}__"
         placeholders[key] = m.group(0)
-        i += 1
         return key
 
-    text = re.sub(r"\$\$.*?\$\$", repl_display, text, flags=re.S)
-
-    # replace inline math $...$
-    def repl_inline(m):
-        nonlocal i
-        key = f"__MATH_{i}__"
-        placeholders[key] = m.group(0)
-        i += 1
-        return key
+    return PLACEHOLDER_RE.sub(repl, text), placeholders
 
-    text = re.sub(r"\$(?:[^$\\]|\\.)*\$", repl_inline, text)
 
-    # replace \cite{...}
-    def repl_cite(m):
-        nonlocal i
-        key = f"__CITE_{i}__"
-        placeholders[key] = m.group(0)
+def restore_placeholders(text, placeholders):
+    return RESTORE_RE.sub(lambda m: placeholders.get(m.group(0), m.group(0)), text)
+
+
+class RateLimiter:
+    """Spaces backend requests at least 1/rate seconds apart (thread-safe)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        time.sleep(start - now)
+
+
+def with_retries(func, retries=4, base_delay=1.0):
+    """Call func, retrying with exponential backoff (plus jitter)."""
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = base_delay * 2 ** attempt * (1 + random.random() * 0.1)
+            print(f'Translation error ({e}); retrying in {delay:.1f}s')
+            time.sleep(delay)
+
+
+def make_batches(texts, max_chars=4000, max_segments=50):
+    """Split texts into batches bounded by total characters and count."""
+    batch, size = [], 0
+    for text in texts:
+        if batch and (size + len(text) > max_chars or len(batch) == max_segments):
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text)
+    if batch:
+        yield batch
+
+
+def translate_all(backend, texts, memory=None, dest='id', concurrency=4,
+                  rate=5.0, max_chars=4000, max_segments=50, retries=4,
+                  base_delay=1.0):
+    """Translate unique placeholderized texts; returns {source: translation}.
+
+    Texts found in the memory are not sent. A batch that still fails after
+    its retries is re-sent segment by segment, and a segment that still
+    fails falls back to its source text (which is not remembered).
+    """
+    translations = {}
+    missing = []
+    for text in dict.fromkeys(texts):
+        if not text.strip():
+            translations[text] = text
+            continue
+        cached = memory.get(text, dest, backend.name) if memory is not None else None
+        if cached is not None:
+            translations[text] = cached
+        else:
+            missing.append(text)
+
+    limiter = RateLimiter(rate)
+
+    def request(batch):
+        def call():
+            limiter.wait()
+            result = backend.translate_batch(batch, dest)
+            if len(result) != len(batch):
+                raise ValueError(f'backend returned {len(result)} of {len(batch)} segments')
+            return result
+        return with_retries(call, retries, base_delay)
+
+    def run_batch(batch):
+        try:
+            return dict(zip(batch, request(batch))), []
+        except Exception as e:
+            print(f'Batch of {len(batch)} segments failed ({e}); translating one by one')
+        done, failed = {}, []
+        for text in batch:
+            try:
+                done[text] = request([text])[0]
+            except Exception as e:
+                print('Translation error:', e)
+                failed.append(text)
+        return done, failed
+
+    batches = list(make_batches(missing, max_chars, max_segments))
+    if batches:
+        print(f'Translating {len(missing)} segments in {len(batches)} batches '
+              f'({concurrency} workers)')
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(run_batch, batch) for batch in batches]
+        for future in as_completed(futures):
+            done, failed = future.result()
+            # SQLite is only touched from this thread
+            for text, translated in done.items():
+                translations[text] = translated
+                if memory is not None:
+                    memory.put(text, dest, translated, backend.name)
+            for text in failed:
+                translations[text] = text
+            if memory is not None:
+                memory.conn.commit()
+    return translations
+
+
+class Segment:
+    """A translatable piece of a file (stored placeholderized)."""
+
+    def __init__(self, text):
+        self.source, self.placeholders = placeholderize(text)
+
+    def render(self, translations):
+        translated = translations.get(self.source, self.source)
+        return restore_placeholders(translated, self.placeholders)
+
+
+HEADING_RE = re.compile(
+    r"\\(?:chapter|section|subsection|subsubsection|paragraph|title|author)"
+    r"\*?(?:\[[^\]]*\])?\{")
+CAPTION_RE = re.compile(r"\\caption(?:\[[^\]]*\])?\{")
+ITEM_RE = re.compile(r"\\item(?:\[[^\]]*\])?\s*")
+BEGIN_RE = re.compile(r"\\begin\{(\w+\*?)\}")
+# Lines starting with these commands are ordinary paragraph text
+INLINE_COMMANDS = re.compile(r"\\(?:textbf|textit|emph|underline|texttt|cite|ref)\b")
+
+
+def match_brace(text, open_pos):
+    """Index of the brace closing text[open_pos] ('{'), honouring nesting."""
+    depth = 0
+    i = open_pos
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return i
         i += 1
-        return key
+    raise ValueError(f'unbalanced brace at offset {open_pos}')
 
-    text = re.sub(r"\\cite\{[^}]*\}", repl_cite, text)
 
-    return text, placeholders
+def warn_unbalanced(text, offset):
+    line = text.count('\n', 0, offset) + 1
+    print(f'Warning: unbalanced brace at line {line}; copied untranslated')
 
 
-def restore_placeholders(text, placeholders):
-    for k, v in placeholders.items():
-        text = text.replace(k, v)
-    return text
+def env_end(text, pos, env):
+    """Offset just after the \\end{env} matching a \\begin{env} at pos."""
+    marker = re.compile(r"\\(begin|end)\{" + re.escape(env) + r"\}")
+    depth = 0
+    for m in marker.finditer(text, pos):
+        depth += 1 if m.group(1) == 'begin' else -1
+        if depth == 0:
+            return m.end()
+    return len(text)
 
 
-def translate_text(translator, text):
-    if not text.strip():
-        return text
-    # googletrans may choke on very long inputs; translate paragraph-by-paragraph
-    try:
-        res = translator.translate(text, dest='id')
-        return res.text
-    except Exception as e:
-        print('Translation error:', e)
-        return text
-
-
-def process_file(path: Path, translator: Translator):
-    print('Processing', path)
-    bak = path.with_suffix(path.suffix + '.bak')
-    if not bak.exists():
-        bak.write_bytes(path.read_bytes())
-
-    lines = path.read_text(encoding='utf-8').splitlines()
-    out_lines = []
-    in_skip_env = None
-    paragraph = []
-
-    def flush_paragraph():
-        nonlocal paragraph
-        if not paragraph:
+def split_captions(chunk, items):
+    """Append chunk to items with every \\caption{...} argument as a Segment."""
+    start = 0
+    for m in CAPTION_RE.finditer(chunk):
+        if m.start() < start:
+            continue
+        try:
+            close = match_brace(chunk, m.end() - 1)
+        except ValueError:
+            warn_unbalanced(chunk, m.start())
+            break
+        items.append(chunk[start:m.end()])
+        items.append(Segment(chunk[m.end():close]))
+        start = close
+    items.append(chunk[start:])
+
+
+def tokenize(text):
+    """Single pass over a file: verbatim chunks and Segments, in order.
+
+    Skipped environments, display math and comments are copied; headings,
+    captions (also multi-line, with nested braces), \\item text and paragraphs
+    become Segments.
+    """
+    items = []
+    paragraph_start = None
+    pos = 0
+    n = len(text)
+
+    def flush(end):
+        nonlocal paragraph_start
+        if paragraph_start is None:
             return
-        block = '\n'.join(paragraph).strip()
-        if block:
-            text_with_ph, placeholders = placeholderize(block)
-            translated = translate_text(translator, text_with_ph)
-            translated = restore_placeholders(translated, placeholders)
-            out_lines.extend(translated.splitlines())
-        else:
-            out_lines.extend(paragraph)
-        paragraph = []
-
-    for line in lines:
+        block = text[paragraph_start:end]
+        body = block.strip()
+        lead = block[:len(block) - len(block.lstrip())]
+        trail = block[len(lead) + len(body):]
+        items.append(lead)
+        items.append(Segment(body))
+        items.append(trail)
+        paragraph_start = None
+
+    while pos < n:
+        eol = text.find('\n', pos)
+        eol = n if eol < 0 else eol + 1
+        line = text[pos:eol]
         stripped = line.strip()
-        # begin environment?
-        m_begin = re.match(r"\\begin\{(\w+)\}", stripped)
-        if m_begin:
-            env = m_begin.group(1)
+        at = pos + len(line) - len(line.lstrip())
+
+        # blank lines and comments end a paragraph and are copied
+        if not stripped or stripped.startswith('%'):
+            flush(pos)
+            items.append(line)
+            pos = eol
+            continue
+
+        if stripped.startswith('\\'):
+            begin = BEGIN_RE.match(text, at)
+            env = begin and begin.group(1).rstrip('*')
             if env in SKIP_ENVS:
-                flush_paragraph()
-                in_skip_env = env
-                out_lines.append(line)
+                # skipped environment: copied, except captions in figure/table
+                flush(pos)
+                end = env_end(text, at, begin.group(1))
+                end_eol = text.find('\n', end)
+                end = n if end_eol < 0 else end_eol + 1
+                if env in ('figure', 'table'):
+                    split_captions(text[pos:end], items)
+                else:
+                    items.append(text[pos:end])
+                pos = end
                 continue
 
-        m_end = re.match(r"\\end\{(\w+)\}", stripped)
-        if m_end and in_skip_env:
-            env = m_end.group(1)
-            out_lines.append(line)
-            in_skip_env = None
-            continue
+            if stripped.startswith('\\['):
+                # display math
+                flush(pos)
+                close = text.find('\\]', at)
+                close = n if close < 0 else close + 2
+                end_eol = text.find('\n', close)
+                end = n if end_eol < 0 else end_eol + 1
+                items.append(text[pos:end])
+                pos = end
+                continue
+
+            heading = HEADING_RE.match(text, at)
+            if heading:
+                flush(pos)
+                try:
+                    close = match_brace(text, heading.end() - 1)
+                except ValueError:
+                    warn_unbalanced(text, at)
+                    items.append(line)
+                    pos = eol
+                    continue
+                items.append(text[pos:heading.end()])
+                items.append(Segment(text[heading.end():close]))
+                end_eol = text.find('\n', close)
+                end = n if end_eol < 0 else end_eol + 1
+                split_captions(text[close:end], items)
+                pos = end
+                continue
 
-        if in_skip_env:
-            # inside skip env: but translate \caption{...} in figure/table
-            if in_skip_env in ('figure', 'table'):
-                cap = re.match(r"(.*\\caption)\{(.*)\}(.*)", line)
-                if cap:
-                    pre, inner, post = cap.group(1), cap.group(2), cap.group(3)
-                    txt, placeholders = placeholderize(inner)
-                    tr = translate_text(translator, txt)
-                    tr = restore_placeholders(tr, placeholders)
-                    out_lines.append(f"{pre}{{{tr}}}{post}")
+            item = ITEM_RE.match(text, at)
+            if item:
+                flush(pos)
+                items.append(text[pos:item.end()])
+                rest = text[item.end():eol]
+                if rest.strip():
+                    body = rest.rstrip()
+                    items.append(Segment(body))
+                    items.append(rest[len(body):])
                 else:
-                    out_lines.append(line)
-            else:
-                out_lines.append(line)
-            continue
+                    items.append(rest)
+                pos = eol
+                continue
 
-        # headings and chapter/section-like commands: translate {...}
-        cmd_match = re.match(r"(\\(?:chapter|section|subsection|subsubsection|paragraph|title|author))\{(.*)\}", stripped)
-        if cmd_match:
-            cmd, inner = cmd_match.group(1), cmd_match.group(2)
-            txt, placeholders = placeholderize(inner)
-            tr = translate_text(translator, txt)
-            tr = restore_placeholders(tr, placeholders)
-            out_lines.append(re.sub(r"\{.*\}", '{' + tr + '}', line, count=1))
-            continue
+            if not INLINE_COMMANDS.match(text, at) and not CAPTION_RE.search(line):
+                # other commands are copied
+                flush(pos)
+                items.append(line)
+                pos = eol
+                continue
 
-        # caption outside environments
-        cap_match = re.match(r"(.*\\caption)\{(.*)\}(.*)", line)
-        if cap_match:
-            pre, inner, post = cap_match.group(1), cap_match.group(2), cap_match.group(3)
-            txt, placeholders = placeholderize(inner)
-            tr = translate_text(translator, txt)
-            tr = restore_placeholders(tr, placeholders)
-            out_lines.append(f"{pre}{{{tr}}}{post}")
+        caption = CAPTION_RE.search(text, pos, eol)
+        if caption:
+            flush(pos)
+            try:
+                close = match_brace(text, caption.end() - 1)
+            except ValueError:
+                warn_unbalanced(text, caption.start())
+                items.append(line)
+                pos = eol
+                continue
+            end_eol = text.find('\n', close)
+            end = n if end_eol < 0 else end_eol + 1
+            split_captions(text[pos:end], items)
+            pos = end
             continue
 
-        # items
-        item_match = re.match(r"(\\item)(.*)", line)
-        if item_match and not stripped.startswith('%'):
-            pre, rest = item_match.group(1), item_match.group(2)
-            if rest.strip():
-                txt, placeholders = placeholderize(rest)
-                tr = translate_text(translator, txt)
-                tr = restore_placeholders(tr, placeholders)
-                out_lines.append(pre + tr)
-            else:
-                out_lines.append(line)
-            continue
+        # otherwise part of a paragraph
+        if paragraph_start is None:
+            paragraph_start = pos
+        pos = eol
 
-        # comments or commands => flush paragraph and copy
-        if stripped.startswith('%') or stripped.startswith('\\') or stripped == '':
-            flush_paragraph()
-            out_lines.append(line)
-            continue
+    flush(n)
+    return items
 
-        # otherwise part of a paragraph: accumulate
-        paragraph.append(line)
 
-    flush_paragraph()
+def collect_segments(path: Path):
+    """Phase 1: split a file into verbatim chunks and Segments, in order."""
+    text = path.read_text(encoding='utf-8')
+    if not text.endswith('\n'):
+        text += '\n'
+    return tokenize(text)
 
-    path.write_text('\n'.join(out_lines) + '\n', encoding='utf-8')
+
+def write_file(path: Path, items, translations, output_dir=None):
+    """Phase 3: reassemble a file in order and write it.
+
+    Without output_dir the source is overwritten (after a .bak backup);
+    otherwise the result goes to output_dir/<name> and the source is kept.
+    """
+    if output_dir is None:
+        target = path
+        bak = path.with_suffix(path.suffix + '.bak')
+        if not bak.exists():
+            bak.write_bytes(path.read_bytes())
+    else:
+        target = Path(output_dir) / path.name
+    print('Writing', target)
+    target.write_text(''.join(item.render(translations) if isinstance(item, Segment)
+                              else item for item in items), encoding='utf-8')
+
+
+def process_file(path: Path, backend, memory=None, dest='id', output_dir=None,
+                 **options):
+    """Translate a single file (all three phases)."""
+    items = collect_segments(path)
+    texts = [item.source for item in items if isinstance(item, Segment)]
+    write_file(path, items, translate_all(backend, texts, memory, dest, **options),
+               output_dir)
 
 
 def main():
-    translator = Translator()
-    files = sorted(TEX_DIR.glob('*.tex'))
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='google')
+    parser.add_argument('--dir', type=Path, default=TEX_DIR)
+    parser.add_argument('--dest', default='id')
+    parser.add_argument('--memory', type=Path, default=MEMORY_PATH,
+                        help='SQLite translation memory')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=5.0,
+                        help='maximum backend requests per second')
+    parser.add_argument('--batch-chars', type=int, default=4000)
+    parser.add_argument('--batch-segments', type=int, default=50)
+    parser.add_argument('--retries', type=int, default=4)
+    parser.add_argument('--output-dir', type=Path, default=None,
+                        help='write translated files here instead of over the '
+                             'sources (default for --backend offline: a temporary directory)')
+    parser.add_argument('--no-commit', action='store_true')
+    args = parser.parse_args()
+
+    # The offline backend only tags text, so it must never replace the chapters
+    if args.backend == 'offline' and args.output_dir is None:
+        args.output_dir = Path(tempfile.mkdtemp(prefix='translate_offline_'))
+    if args.output_dir is not None:
+        if args.output_dir.resolve() == args.dir.resolve():
+            parser.error('--output-dir must differ from --dir')
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    files = sorted(args.dir.glob('*.tex'))
     if not files:
-        print('No files found in', TEX_DIR)
+        print('No files found in', args.dir)
         return
+
+    # Phase 1: collect the segments of every file
+    collected = {}
     for f in files:
-        process_file(f, translator)
+        print('Processing', f)
+        collected[f] = collect_segments(f)
+    texts = [item.source for items in collected.values()
+             for item in items if isinstance(item, Segment)]
+
+    # Phase 2: translate everything not yet in the memory
+    backend = BACKENDS[args.backend]()
+    memory = TranslationMemory(args.memory)
+    try:
+        translations = translate_all(
+            backend, texts, memory, args.dest, concurrency=args.concurrency,
+            rate=args.rate, max_chars=args.batch_chars,
+            max_segments=args.batch_segments, retries=args.retries)
+    finally:
+        memory.close()
+    print(f'Translation memory: {memory.hits} hits, {memory.misses} misses, '
+          f'{backend.calls} backend calls')
+
+    # Phase 3: reassemble each file in order
+    for f, items in collected.items():
+        write_file(f, items, translations, args.output_dir)
+
+    if args.no_commit or args.output_dir is not None:
+        return
 
     # git add/commit
     try:
         import subprocess
-        subprocess.run(['git', 'add', str(TEX_DIR)], check=False)
+        subprocess.run(['git', 'add', str(args.dir)], check=False)
         subprocess.run(['git', 'commit', '-m', 'i18n: machine-translate chapters to Indonesian (draft)'], check=False)
     except Exception:
         pass